@@ -1,4 +1,4 @@
-from battleship.ship import Ship, ShipFactory
+from battleship.ship import MAX_BOARD_WIDTH, Ship, ShipFactory
 from battleship.convert import CellConverter
 
 
@@ -23,8 +23,12 @@ class Board:
                 arrangements of the ships on the board? Defaults to True.
                 
         Raises:
-            ValueError if the number of ships is False
+            ValueError if the number of ships is False, or if the board is
+                more than MAX_BOARD_WIDTH cells wide
         """
+        if size[0] > MAX_BOARD_WIDTH:
+            raise ValueError(f"The board can be at most {MAX_BOARD_WIDTH} cells wide.")
+
         self.width = size[0]
         self.height = size[1]
 
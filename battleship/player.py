@@ -1,22 +1,32 @@
 import random
+from collections import deque
 
 from battleship.board import Board
 from battleship.convert import CellConverter
-from battleship.ship import Ship
+
+# (dx, dy) offsets of the orthogonal neighbours of a cell
+DIRS4 = ((1, 0), (-1, 0), (0, 1), (0, -1))
+# (dx, dy) offsets of all 8 neighbours of a cell, orthogonal ones first
+DIRS8 = DIRS4 + ((1, -1), (-1, -1), (1, 1), (-1, 1))
 
 
 class Player:
     """ Class representing the player
     """
+    __slots__ = ("board", "name", "_w", "_h", "_rng")
+
     count = 0  # for keeping track of number of players
 
-    def __init__(self, board=None, name=None):
+    def __init__(self, board=None, name=None, seed=None):
         """ Initialises a new player with its board.
 
         Args:
             board (Board): The player's board. If not provided, then a board
                 will be generated automatically
             name (str): Player's name
+            seed (int): Seed of the player's own random number generator. If
+                not provided, it is drawn from the random module, so that
+                random.seed() still makes a whole game reproducible
         """
 
         if board is None:
@@ -24,12 +34,20 @@ class Player:
         else:
             self.board = board
 
+        # Board dimensions, read often when choosing targets
+        self._w = self.board.width
+        self._h = self.board.height
+
         Player.count += 1
         if name is None:
             self.name = f"Player {self.count}"
         else:
             self.name = name
 
+        if seed is None:
+            seed = random.getrandbits(64)
+        self._rng = random.Random(seed)
+
     def __str__(self):
         return self.name
 
@@ -72,6 +90,7 @@ class Player:
 class ManualPlayer(Player):
     """ A player playing manually via the terminal
     """
+    __slots__ = ("converter", "_parse")
 
     def __init__(self, board, name=None):
         """ Initialise the player with a board and other attributes.
@@ -84,6 +103,12 @@ class ManualPlayer(Player):
         super().__init__(board=board, name=name)
         self.converter = CellConverter((board.width, board.height))
 
+        # (x, y) coordinates of every cell of the board, keyed by their string
+        # representation (e.g. "B1")
+        self._parse = {self.converter.to_str((x, y)): (x, y)
+                       for x in range(1, self._w + 1)
+                       for y in range(1, self._h + 1)}
+
     def select_target(self):
         """ Read coordinates from user prompt.
                
@@ -96,7 +121,11 @@ class ManualPlayer(Player):
         while True:
             try:
                 coord_str = input('coordinates target = ')
-                x, y = self.converter.from_str(coord_str)
+                cell = self._parse.get(coord_str.strip().upper())
+                if cell is None:
+                    # Let the converter handle (or reject) any other spelling
+                    cell = self.converter.from_str(coord_str)
+                x, y = cell
                 return x, y
             except ValueError as error:
                 print(error)
@@ -108,17 +137,25 @@ class RandomPlayer(Player):
     However, it does not play at the positions:
     - that it has previously attacked
     """
+    __slots__ = ("tracker", "_remaining")
 
-    def __init__(self, name=None):
+    def __init__(self, name=None, seed=None):
         """ Initialise the player with an automatic board and other attributes.
         
         Args:
             name (str): Player's name
+            seed (int): Seed of the player's random number generator
         """
         # Initialise with a board with ships automatically arranged.
-        super().__init__(board=Board(), name=name)
+        super().__init__(board=Board(), name=name, seed=seed)
         self.tracker = set()
 
+        # Cells that have not been attacked yet, in a random order
+        self._remaining = [(x, y)
+                           for x in range(1, self._w + 1)
+                           for y in range(1, self._h + 1)]
+        self._rng.shuffle(self._remaining)
+
     def select_target(self):
         """ Generate a random cell that has previously not been attacked.
         
@@ -134,48 +171,54 @@ class RandomPlayer(Player):
 
     def generate_random_target(self):
         """ Generate a random cell that has previously not been attacked.
-               
-        Returns:
-            tuple[int, int] : (x, y) cell coordinates at which to launch the 
-                next attack
-        """
-        has_been_attacked = True
-        random_cell = None
-
-        while has_been_attacked:
-            random_cell = self.get_random_coordinates()
-            has_been_attacked = random_cell in self.tracker
-
-        return random_cell
 
-    def get_random_coordinates(self):
-        """ Generate random coordinates.
+        The cells are shuffled once when the player is created, so the next
+        target is simply the next cell that has not been attacked yet.
                
         Returns:
             tuple[int, int] : (x, y) cell coordinates at which to launch the 
                 next attack
         """
-        x = random.randint(1, self.board.width)
-        y = random.randint(1, self.board.height)
-        return (x, y)
+        return self._remaining.pop()
 
 
 class AutomaticPlayer(Player):
     """ Player playing automatically using a strategy."""
+    __slots__ = ("tracker", "sunken_ships", "successful_hits", "last_target",
+                 "_open_hits", "_nbr_cache", "_candidates", "_candidate_order")
 
-    def __init__(self, name=None):
+    def __init__(self, name=None, seed=None):
         """ Initialise the player with an automatic board and other attributes.
         
         Args:
             name (str): Player's name
+            seed (int): Seed of the player's random number generator
         """
         # Initialise with a board with ships automatically arranged.
-        super().__init__(board=Board(), name=name)
+        super().__init__(board=Board(), name=name, seed=seed)
         self.tracker = set()
-        self.sunken_ships = []
-        self.successful_hits = []
+        self.sunken_ships = []  # (start, end) cell coordinates of each sunken ship
+        self.successful_hits = set()
         self.last_target = None
 
+        # Successful hits that are not part of any sunken ship yet
+        self._open_hits = set()
+
+        # Neighbours of each cell, keyed by (cell, cell_hunt).
+        # The board dimensions never change, so entries stay valid
+        self._nbr_cache = {}
+
+        # Cells that are still worth attacking: they have not been attacked
+        # yet and are not next to a ship that has already sunk
+        self._candidates = {(x, y)
+                            for x in range(1, self._w + 1)
+                            for y in range(1, self._h + 1)}
+
+        # The same cells in a random order, consumed from the end when there
+        # is no hunt. Cells that are no longer candidates are skipped
+        self._candidate_order = list(self._candidates)
+        self._rng.shuffle(self._candidate_order)
+
     def select_target(self):
         """ Select target coordinates to attack.
         
@@ -186,115 +229,97 @@ class AutomaticPlayer(Player):
 
         target_cell = self.generate_random_target()
         self.tracker.add(target_cell)
+        self._candidates.discard(target_cell)
         return target_cell
 
     def generate_random_target(self):
         """ Generate a random cell that has previously not been attacked.
 
+        The cell is drawn from the remaining candidate cells, so it is never
+        out of bounds, already attacked or close to a sunken ship.
+
         Returns:
             tuple[int, int] : (x, y) cell coordinates at which to launch the
                 next attack
         """
 
-        # Initialize the conditions to enter the while loop at least once
         random_cell = None
-        has_been_attacked = True
-
-        sunken_ships = self.are_there_sunken_ships()
-        is_close_to_ship = True
 
+        # If there has been a successful attack that has not yet resulted in the sinking of
+        # an opponent's ship, then the priority is to sink that ship. This is called a "hunt"
         is_there_a_hunt, list_of_hits = self.is_there_a_hunt()
-        is_a_hunting_cell = False
-
-        within_bounds = False
-
-        # Stays in the loop until the cell chosen:
-        #   - Is not close to a sunken ship
-        #   - Is within bounds
-        #   - Has not been attacked already
-        #   - Is a 'hunting cell' in the case of a 'hunt' (hit ship that has not been downed yet)
-        while has_been_attacked or is_close_to_ship or not is_a_hunting_cell or not within_bounds:
-
-            random_cell = self.get_random_coordinates()
-
-            # If there has been a successful attack that has not yet resulted in the sinking of
-            # an opponent's ship, then the priority is to sink that ship. This is called a "hunt"
-            if is_there_a_hunt:
+        if is_there_a_hunt:
+            random_cell = self._pick_hunt(list_of_hits)
 
-                # In this case, a possible cell is already given by the function.
-                # It replaces the random_cell generated previously
-                is_a_hunting_cell, random_cell = self.hunting_cell(random_cell, list_of_hits)
-
-            else:
-                is_a_hunting_cell = True
-
-            # The attack should be on a cell that has not yet been attacked and is within bounds
-            has_been_attacked = random_cell in self.tracker
-            within_bounds = self.is_it_within_bounds(random_cell)
-
-            # If there are sunken ships, the attack should not be launched on a nearby cell
-            if sunken_ships:
-                is_close_to_ship = self.is_close_to_ship(random_cell)
-            else:
-                is_close_to_ship = False
+        if random_cell is None:
+            random_cell = self._pick_search()
 
         self.last_target = random_cell
 
         return random_cell
 
-    def are_there_sunken_ships(self):
-        """ Checks if there are sunken ships already
+    def _pick_search(self):
+        """ Picks a uniformly random candidate cell, when there is no hunt.
+
+        The next candidate in the shuffled order is a uniformly random one, so
+        cells that stopped being candidates are simply skipped.
 
         Returns:
-            bool: True if there are sunken ships, False otherwise
+            tuple[int, int]: cell coordinates of the new target
         """
-        return len(self.sunken_ships) > 0
+        candidates = self._candidates
+        candidate_order = self._candidate_order
+
+        random_cell = candidate_order.pop()
+        while random_cell not in candidates:
+            random_cell = candidate_order.pop()
 
-    def hunting_cell(self, cell, list_of_hits):  # TO modify
+        return random_cell
+
+    def _pick_hunt(self, list_of_hits):
         """ Given that there were successful hits that were not part of any
-                sunken ships, this function checks that the target selected (cell)
-                is, at least, a neighbour of that successful hit. If there are multiple
-                successful hits already, it gets an even better target thanks to the
-                get_better_target() method.
+                sunken ships, this function picks a target among the candidate
+                neighbours of that successful hit. If there are multiple
+                successful hits already, it picks an even better target thanks to
+                the get_better_targets() method.
 
         Args:
-            cell (tuple[int, int]) : (x, y) cell coordinates which we are planning on
-                launching the next attack
-            list_of_hits (list[(int, int), ... , (int, int)] : list of the cells that
+            list_of_hits (set[(int, int), ... , (int, int)] : set of the cells that
                 were successful hits yet not part of any sunken ship
 
         Returns:
-            bool: True if the cell is a neighbour of a hit cell, otherwise False
-            tuple[int, int]: cell coordinates of the new target if there were more hints
-            (see doc string of the next function), otherwise returns the cell coordinates
-            it was given (cell)
+            tuple[int, int]: cell coordinates of the new target, or None if none of
+                the hunting cells can still be attacked
         """
 
         if len(list_of_hits) > 1:
-            new_target = self.get_better_target(list_of_hits)
-            print(new_target)
-            return True, new_target
+            hunting_cells = self.get_better_targets(list_of_hits)
         else:
-            neighbours = self.get_neighbours(list_of_hits[0], cell_hunt=True)
-            if cell in neighbours:
-                return True, cell
-            else:
-                return False, cell
+            hunting_cells = self.get_neighbours(next(iter(list_of_hits)), cell_hunt=True)
+
+        candidates = self._candidates
+        possible_cells = [cell for cell in hunting_cells if cell in candidates]
+
+        if not possible_cells:
+            return None
+
+        return self._rng.choice(possible_cells)
 
-    def get_better_target(self, list_of_hits):
+    def get_better_targets(self, list_of_hits):
         """ Given that there are multiple successful hits that were not part
                 of any sunken ship, it means the orientation of the soon-to-be
-                sunken ship can be deduced and hence a better target can be obtained
+                sunken ship can be deduced and hence better targets can be obtained
 
         Args:
-            list_of_hits (list[(int, int), ... , (int, int)] : list of the cells that
+            list_of_hits (set[(int, int), ... , (int, int)] : set of the cells that
                 were successful hits yet not part of any sunken ship
 
         Returns:
-            tuple[(int, int)]: new target to attack
+            tuple[(int, int), (int, int)]: one cell before the start cell and one
+                cell after the end cell of the 'hit' parts of the ship
         """
 
-        cell = list_of_hits[0]
+        cell = next(iter(list_of_hits))
 
         # Find the start and end of the 'hit' parts of the ship
         start, end = self.find_start_and_end(cell)
@@ -304,10 +329,7 @@ class AutomaticPlayer(Player):
         else:  # Ship is horizontal
             possible_cells = ((start[0] - 1, start[1]), (end[0] + 1, end[1]))
 
-        # Choose between one cell before the start cell or one cell after the end cell
-        new_target = random.choice(possible_cells)
-
-        return new_target
+        return possible_cells
 
     def is_there_a_hunt(self):
         """ Checks if there are hit cells that are not part of any sunken ship
@@ -315,66 +337,53 @@ class AutomaticPlayer(Player):
 
         Returns:
             bool: True if there is a hunt, False otherwise
-            list[(int, int), ... , (int, int)]: list of coordinates of the cells that
+            set[(int, int), ... , (int, int)]: set of coordinates of the cells that
                 were successful hits yet not part of any sunken ship
         """
 
-        list_of_hits = self.successful_hits.copy()
-
-        # Remove from the list_of_hits all the hits that belong to sunken ships
-        if len(self.sunken_ships) > 0:
-            for ship in self.sunken_ships:
-                for cell in ship.cells:
-                    index = list_of_hits.index(cell)
-                    list_of_hits.pop(index)
-
-        return len(list_of_hits) > 0, list_of_hits
-
-    def is_close_to_ship(self, cell):
-        """ Checks if the given cell is near a sunken ship
-
-        Args:
-            cell (tuple[(int, int)]): coordinates of a cell to check if it is
-                near a sunken ship
-
-        Returns:
-            bool: True if the given cell is near a ship, False otherwise
-        """
-
-        for ship in self.sunken_ships:
-            if ship.is_near_cell(cell):
-                return True
-            else:
-                pass
-
-        return False
-
-    def get_random_coordinates(self):
-        """ Generate random coordinates.
-
-        Returns:
-            tuple[int, int] : (x, y) cell coordinates at which to launch the
-                next attack
-        """
-        x = random.randint(1, self.board.width)
-        y = random.randint(1, self.board.height)
-        return (x, y)
+        return len(self._open_hits) > 0, self._open_hits
 
     def receive_result(self, is_ship_hit, has_ship_sunk):
         """ Receive the results of each turn:
                 - Has a ship been hit ?
                 - Has a ship sunken ?
-            Updates two attributes:
+            Updates four attributes:
                 - self.successful_hits
                 - self.sunken_ships
+                - self._open_hits
+                - self._candidates
         """
         if is_ship_hit:
-            self.successful_hits.append(self.last_target)
+            self.successful_hits.add(self.last_target)
+            self._open_hits.add(self.last_target)
 
         if is_ship_hit and has_ship_sunk:
             start, end = self.find_start_and_end(self.last_target)
-            ship = Ship(start, end, should_validate=True)
-            self.sunken_ships.append(ship)
+            self.sunken_ships.append((start, end))
+
+            # The hits of this ship no longer belong to a hunt
+            self._open_hits.difference_update(self.get_ship_surroundings(start, end, margin=0))
+
+            # No other ship can be near a sunken ship
+            self._candidates.difference_update(self.get_ship_surroundings(start, end))
+
+    def get_ship_surroundings(self, start, end, margin=1):
+        """ Gets all the cells of the board that are at most margin cells away
+                from a ship, including the cells of the ship itself
+
+        Args:
+            start (tuple[int, int]): top-most or left-most cell coordinates of the ship
+            end (tuple[int, int]): bottom-most or right-most cell coordinates of the ship
+            margin (int): how far from the ship the cells can be. With a margin of 0,
+                only the cells of the ship are returned. Defaults to 1
+
+        Returns:
+            set[(int, int), ... , (int, int)]: set of the surrounding cells
+        """
+        x_min, x_max = max(start[0] - margin, 1), min(end[0] + margin, self._w)
+        y_min, y_max = max(start[1] - margin, 1), min(end[1] + margin, self._h)
+
+        return {(x, y) for x in range(x_min, x_max + 1) for y in range(y_min, y_max + 1)}
 
     def find_start_and_end(self, cell):
         """ Given a cell, finds the start and end coordinates of the
@@ -392,74 +401,36 @@ class AutomaticPlayer(Player):
                 the ending cell coordinates of the Ship on the board
         """
 
-        start, end = None, None
-
-        cells = self.get_all_cells(cell, except_cell=cell)
-        cells += (cell,)
-
-        if len(cells) == 1:
-            return cell, cell
-
-        max_x = 0
-        min_x = self.board.width + 1
-        max_y = 0
-        min_y = self.board.height + 1
-
-        if self.is_this_ship_vertical(cells):
-            for cell in cells:
-                if min_y > cell[1]:
-                    min_y = cell[1]
-                    start = cell
-                if max_y < cell[1]:
-                    max_y = cell[1]
-                    end = cell
-        else:
-            for cell in cells:
-                if min_x > cell[0]:
-                    min_x = cell[0]
-                    start = cell
-                if max_x < cell[0]:
-                    max_x = cell[0]
-                    end = cell
+        cells = self.get_all_cells(cell)
+        cells.append(cell)
 
-        return start, end
+        # The cells are aligned, so comparing the (x, y) tuples compares y for a
+        # vertical ship and x for a horizontal one. min() and max() do it in C
+        return min(cells), max(cells)
 
-    def is_this_ship_vertical(self, cells):
-        """ Checks if this ship is vertical
-
-        Args:
-            cells (tuple[(int, int), ... , (int, int)]): tuple of tuples of the coordinates
-                of a ship we want to check the orientation for
-
-        Returns:
-            bool: True if the ship is vertical, False otherwise
-        """
-        return cells[0][0] == cells[1][0]
-
-    def get_all_cells(self, cell, except_cell=None):
-        """ Recursive function which gathers the nearby hit cells for a given cell
+    def get_all_cells(self, cell):
+        """ Gathers the nearby hit cells for a given cell, following successful
+                hits from neighbour to neighbour (breadth-first search)
 
         Args:
             cell (tuple[int, int]): coordinates of a cell to find the nearby successful
                 hit cells for
-            except_cell (tuple[int, int]): coordinates of a cell to omit in the search
-                for nearby successful hit cells
 
         Returns:
-            tuple[(int, int), ... , (int, int)]: tuple of the nearby successful hit cells
+            list[(int, int), ... , (int, int)]: list of the nearby successful hit cells,
+                each visited once and without the given cell
         """
 
-        all_hit_cells_nearby = ()
-        neighbours = self.get_neighbours(cell)
-
-        for neighbour in neighbours:
-            if neighbour in self.successful_hits and neighbour != except_cell:
-                all_hit_cells_nearby += (neighbour,)
+        all_hit_cells_nearby = []
+        visited = {cell}
+        cells_to_visit = deque([cell])
 
-                new_neighbours = self.get_all_cells(neighbour, except_cell=cell)
-                if new_neighbours is not None:
-                    for new_neighbour in new_neighbours:
-                        all_hit_cells_nearby += (new_neighbour,)
+        while cells_to_visit:
+            for neighbour in self.get_neighbours(cells_to_visit.popleft()):
+                if neighbour in self.successful_hits and neighbour not in visited:
+                    visited.add(neighbour)
+                    all_hit_cells_nearby.append(neighbour)
+                    cells_to_visit.append(neighbour)
 
         return all_hit_cells_nearby
 
@@ -475,48 +446,31 @@ class AutomaticPlayer(Player):
             tuple[(int, int), ... , (int, int)]: tuple of the neighbouring cells
         """
 
-        top, bottom, left, right, top_left, top_right, bottom_left, bottom_right = [None] * 8
-
-        neighbours = ()
-
-        if cell[0] <= self.board.width - 1:
-            right = (cell[0] + 1, cell[1])
-            neighbours += (right,)
-        if cell[0] >= 2:
-            left = (cell[0] - 1, cell[1])
-            neighbours += (left,)
-        if cell[1] <= self.board.height - 1:
-            bottom = (cell[0], cell[1] + 1)
-            neighbours += (bottom,)
-        if cell[1] >= 2:
-            top = (cell[0], cell[1] - 1)
-            neighbours += (top,)
-
-        if not cell_hunt:
-            if top is not None and right is not None:
-                top_right = (cell[0] + 1, cell[1] - 1)
-                neighbours += (top_right,)
-            if top is not None and left is not None:
-                top_left = (cell[0] - 1, cell[1] - 1)
-                neighbours += (top_left,)
-            if bottom is not None and right is not None:
-                bottom_right = (cell[0] + 1, cell[1] + 1)
-                neighbours += (bottom_right,)
-            if bottom is not None and right is not None:
-                bottom_left = (cell[0] - 1, cell[1] + 1)
-                neighbours += (bottom_left,)
+        key = (cell, cell_hunt)
+        cached_neighbours = self._nbr_cache.get(key)
+        if cached_neighbours is not None:
+            return cached_neighbours
+
+        if cell_hunt:
+            neighbours = self._neighbours4(cell)
+        else:
+            neighbours = self._neighbours8(cell)
+        self._nbr_cache[key] = neighbours
 
         return neighbours
 
-    def is_it_within_bounds(self, cell):
-        """ Checks if a cell is within bound
+    def _neighbours4(self, cell):
+        """ Gets the orthogonal neighbours of a cell that are within bounds."""
+        x, y = cell
+        w, h = self._w, self._h
 
-        Args:
-            cell (tuple[int, int]): coordinates of a cell to check if it
-                is in bound for
+        return tuple((x + dx, y + dy) for dx, dy in DIRS4
+                     if 1 <= x + dx <= w and 1 <= y + dy <= h)
 
-        Returns:
-            bool: True if the cell is in bound, False otherwise
-        """
-        return (1 <= cell[0] <= self.board.width and
-                1 <= cell[1] <= self.board.height)
+    def _neighbours8(self, cell):
+        """ Gets all 8 neighbours of a cell that are within bounds."""
+        x, y = cell
+        w, h = self._w, self._h
+
+        return tuple((x + dx, y + dy) for dx, dy in DIRS8
+                     if 1 <= x + dx <= w and 1 <= y + dy <= h)
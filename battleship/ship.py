@@ -2,12 +2,84 @@ import random
 
 from battleship.convert import CellConverter
 
+# Number of bits used per board row in the ship bitmasks. Bit x of row y
+# represents the cell (x, y), so row 0 and column 0 are spare and hold the
+# halo of ships on the top and left edges, and the last column holds the halo
+# of ships on the right edge
+MASK_ROW_BITS = 64
+
+# Widest board whose ships can be compared with their bitmasks
+MAX_BOARD_WIDTH = MASK_ROW_BITS - 2
+
+# Board size of a ship created without one. An int rather than float("inf")
+# keeps the bound comparisons between ints
+_INF = 2 ** 31 - 1
+
+# (dx, dy) offsets of the 8 neighbours of a cell
+_OFFSETS = ((-1, -1), (-1, 0), (-1, 1), (0, -1), (0, 1), (1, -1), (1, 0), (1, 1))
+
+
+def _box_mask(x_start, y_start, x_end, y_end):
+    """ Get the bitmask of all the cells from (x_start, y_start) to (x_end, y_end)."""
+    row_mask = ((1 << (x_end - x_start + 1)) - 1) << x_start
+    mask = 0
+    for y in range(y_start, y_end + 1):
+        mask |= row_mask << (y * MASK_ROW_BITS)
+
+    return mask
+
+
+def _run_starts(free_mask, length, stride):
+    """ Get the bitmask of the cells that start a run of length free cells.
+
+    The cells of a run are stride bits apart: 1 for a run along a row, and
+    MASK_ROW_BITS for a run along a column. All the rows (or columns) are
+    processed at once, and the run length doubles at each step, so only about
+    log2(length) shifts are needed.
+    """
+    starts = free_mask
+    run_length = 1
+
+    while run_length < length:
+        step = min(run_length, length - run_length)
+        starts &= starts >> (step * stride)
+        run_length += step
+
+    return starts
+
+
+def _nth_set_bit(mask, n):
+    """ Get the position of the n-th lowest set bit of a bitmask (n starts at 0).
+
+    Bisects the bitmask, counting the set bits of its lower half at each step.
+    """
+    position = 0
+    width = mask.bit_length()
+
+    while width > 1:
+        half = width // 2
+        lower_half = mask & ((1 << half) - 1)
+        lower_count = lower_half.bit_count()
+
+        if n < lower_count:
+            mask = lower_half
+            width = half
+        else:
+            n -= lower_count
+            mask >>= half
+            position += half
+            width -= half
+
+    return position
+
 
 class Ship:
     """ Represent a ship that is placed on the board.
     """
+    __slots__ = ("x_start", "y_start", "x_end", "y_end", "cells", "mask", "halo_mask",
+                 "damaged_cells", "board_width", "board_height")
 
-    def __init__(self, start, end, should_validate=True, board_width=float("inf"), board_height=float("inf")):
+    def __init__(self, start, end, should_validate=True, board_width=_INF, board_height=_INF):
         """ Creates a ship given its start and end coordinates on the board. 
         
         The order of the cells do not matter.
@@ -20,20 +92,24 @@ class Ship:
             should_validate (bool): should the constructor check whether the 
                 given coordinates result in a horizontal or vertical ship? 
                 Defaults to True.
+            board_width (int): width of the board the ship is on. Defaults
+                to an unbounded board
+            board_height (int): height of the board the ship is on. Defaults
+                to an unbounded board
 
         Raises:
             ValueError: if should_validate==True and 
                 if the ship is neither horizontal nor vertical
         """
         # Start and end (x, y) cell coordinates of the ship
-        self.x_start, self.y_start = start
-        self.x_end, self.y_end = end
+        x_start, y_start = start
+        x_end, y_end = end
 
         # make x_start on left and x_end on right
-        self.x_start, self.x_end = min(self.x_start, self.x_end), max(self.x_start, self.x_end)
+        self.x_start, self.x_end = (x_start, x_end) if x_start <= x_end else (x_end, x_start)
 
         # make y_start on top and y_end on bottom
-        self.y_start, self.y_end = min(self.y_start, self.y_end), max(self.y_start, self.y_end)
+        self.y_start, self.y_end = (y_start, y_end) if y_start <= y_end else (y_end, y_start)
 
         if should_validate:
             if not self.is_horizontal() and not self.is_vertical():
@@ -43,6 +119,18 @@ class Ship:
         # Set of all (x,y) cell coordinates that the ship occupies
         self.cells = self.get_cells()
 
+        # Bitmask of the cells that the ship occupies, and of all the cells
+        # that are at most one cell away from the ship (its own cells included).
+        # Used by ShipFactory to compare ships. A ship that is not within the
+        # first MAX_BOARD_WIDTH columns and the rows from 1 does not have any,
+        # since some of these cells would not map to a bit
+        if 1 <= self.x_start and self.x_end <= MAX_BOARD_WIDTH and 1 <= self.y_start:
+            self.mask = _box_mask(self.x_start, self.y_start, self.x_end, self.y_end)
+            self.halo_mask = _box_mask(self.x_start - 1, self.y_start - 1,
+                                       self.x_end + 1, self.y_end + 1)
+        else:
+            self.mask = self.halo_mask = None
+
         # Set of (x,y) cell coordinates of the ship that have been damaged
         self.damaged_cells = set()
 
@@ -87,20 +175,13 @@ class Ship:
             set[tuple] : Set of (x ,y) coordinates of all cells a ship occupies
         """
 
-        cells = []
-        if self.is_vertical() and self.is_horizontal():
-            return {(self.x_start, self.y_start)}
-        elif self.is_horizontal():
-            for x_coordinate in range(self.x_end - self.x_start + 1):
-                cells.append(tuple([self.x_start + x_coordinate, self.y_start]))
-        elif self.is_vertical():
-            for y_coordinate in range(self.y_end - self.y_start + 1):
-                cells.append(tuple([self.x_start, self.y_start + y_coordinate]))
+        if self.x_start == self.x_end:  # Vertical (or one-square) ship
+            return {(self.x_start, y) for y in range(self.y_start, self.y_end + 1)}
+        elif self.y_start == self.y_end:  # Horizontal ship
+            return {(x, self.y_start) for x in range(self.x_start, self.x_end + 1)}
         else:
             raise ValueError("Ship is neither horizontal nor vertical")
 
-        return set(cells)
-
     def length(self):
         """ Get length of ship (the number of cells the ship occupies).
         
@@ -121,7 +202,6 @@ class Ship:
             bool : return True if the given cell is one of the cells occupied 
                 by the ship. Otherwise, return False
         """
-        # TODO: Complete this method
         return cell in self.cells
 
     def receive_damage(self, cell):
@@ -141,7 +221,7 @@ class Ship:
                 Return False otherwise.
         """
         ship_was_hit = False
-        if self.is_occupying_cell(cell):
+        if cell in self.cells:
             ship_was_hit = True
             self.damaged_cells.add(cell)
 
@@ -164,17 +244,14 @@ class Ship:
                 Otherwise, return False
         """
 
-        has_sunk_condition = False
-
-        if self.damaged_cells == self.cells:
-            has_sunk_condition = True
-
-        return has_sunk_condition
+        # receive_damage only adds cells of the ship to damaged_cells
+        return len(self.damaged_cells) == len(self.cells)
 
     def is_near_ship(self, other_ship):
         """ Check whether a ship is near another ship instance.
         
-        Hint: Use the method is_near_cell(...) to complete this method.
+        The other ship is near if any of its cells is near this ship (see
+        is_near_cell(...)).
 
         Args:
             other_ship (Ship): another Ship instance against which to compare
@@ -184,11 +261,10 @@ class Ship:
                 near to this ship. Returns False otherwise.
         """
 
-        for cell_of_other_ship in other_ship.cells:
-            if self.is_near_cell(cell_of_other_ship):
-                return True
-
-        return False
+        # Both ships are straight lines, so this is the case if the other ship
+        # overlaps the box of the cells near this ship
+        return (other_ship.x_start <= self.x_end + 1 and self.x_start - 1 <= other_ship.x_end and
+                other_ship.y_start <= self.y_end + 1 and self.y_start - 1 <= other_ship.y_end)
 
     def is_near_cell(self, cell):
         """ Check whether the ship is near an (x,y) cell coordinate.
@@ -218,61 +294,33 @@ class Ship:
                 ship. Returns False otherwise.
         """
 
-        for cell_of_ship in self.cells:
-            neighbours = self.get_neighbours(cell_of_ship)
-            if cell in neighbours:
-                return True
-
-        return False
+        # The ship is a straight line, so the cells near it form a box
+        return (self.x_start - 1 <= cell[0] <= self.x_end + 1 and
+                self.y_start - 1 <= cell[1] <= self.y_end + 1)
 
     def get_neighbours(self, cell):
-        """ Gets all 8 neighbours of a certain cell.
+        """ Gets all 8 neighbours of a certain cell that are on the board.
 
         Args:
             cell (tuple[int, int]): tuple of 2 positive integers representing
                 the (x, y) cell coordinates that we wish to get the neighbours of
 
         Returns:
-            neighbours (tuple[(x1, y1), ..., (xN, yN)]): tuple of the coordinates of
+            neighbours (frozenset[(x1, y1), ..., (xN, yN)]): set of the coordinates of
                 all the neighbouring cells of cell
         """
-
-        top, bottom, left, right, top_left, top_right, bottom_left, bottom_right = [None] * 8
-
-        neighbours = ()
-
-        if cell[0] <= self.board_width:
-            right = (cell[0] + 1, cell[1])
-            neighbours += (right,)
-        if cell[0] >= 2:
-            left = (cell[0] - 1, cell[1])
-            neighbours += (left,)
-        if cell[1] <= self.board_height:
-            bottom = (cell[0], cell[1] + 1)
-            neighbours += (bottom,)
-        if cell[1] >= 2:
-            top = (cell[0], cell[1] - 1)
-            neighbours += (top,)
-        if top is not None and right is not None:
-            top_right = (cell[0] + 1, cell[1] - 1)
-            neighbours += (top_right,)
-        if top is not None and left is not None:
-            top_left = (cell[0] - 1, cell[1] - 1)
-            neighbours += (top_left,)
-        if bottom is not None and right is not None:
-            bottom_right = (cell[0] + 1, cell[1] + 1)
-            neighbours += (bottom_right,)
-        if bottom is not None and right is not None:
-            bottom_left = (cell[0] - 1, cell[1] + 1)
-            neighbours += (bottom_left,)
-
-        return neighbours
+        x, y = cell
+        return frozenset((x + dx, y + dy) for dx, dy in _OFFSETS
+                         if 1 <= x + dx <= self.board_width and 1 <= y + dy <= self.board_height)
 
 
 class ShipFactory:
     """ Class to create new ships in specific configurations."""
 
-    def __init__(self, board_size=(10, 10), ships_per_length=None):
+    # CellConverter for each board size, shared by create_ship_from_str calls
+    _converter_cache = {}
+
+    def __init__(self, board_size=(10, 10), ships_per_length=None, seed=None):
         """ Initialises the ShipFactory class with necessary information.
         
         Args: 
@@ -280,8 +328,22 @@ class ShipFactory:
                 terms of number of cells. Defaults to (10, 10)
             ships_per_length (dict): A dict with the length of ship as keys and
                 the count as values. Defaults to 1 ship each for lengths 1-5.
+            seed (int): Seed of the factory's own random number generator. If
+                not provided, it is drawn from the random module, so that
+                random.seed() still makes the generated ships reproducible
+
+        Raises:
+            ValueError: if the board is more than MAX_BOARD_WIDTH cells wide
         """
+        if board_size[0] > MAX_BOARD_WIDTH:
+            raise ValueError(f"The board can be at most {MAX_BOARD_WIDTH} cells wide.")
+
         self.board_size = board_size
+        self._W, self._H = board_size
+
+        if seed is None:
+            seed = random.getrandbits(64)
+        self._rng = random.Random(seed)
 
         if ships_per_length is None:
             # Default: lengths 1 to 5, one ship each
@@ -304,7 +366,12 @@ class ShipFactory:
         Returns:
             Ship : a Ship instance created from start to end string coordinates
         """
-        converter = CellConverter(board_size)
+        # Also accepts a list such as [10, 10], which cannot be a dict key
+        key = tuple(board_size)
+        converter = cls._converter_cache.get(key)
+        if converter is None:
+            cls._converter_cache[key] = converter = CellConverter(key)
+
         return Ship(start=converter.from_str(start),
                     end=converter.from_str(end))
 
@@ -321,35 +388,92 @@ class ShipFactory:
         
         Returns:
             list[Ships] : A list of Ship instances, adhering to the rules above
+
+        Raises:
+            ValueError: if the ships cannot all be placed on the board
         """
 
-        ships = []
-        ship_to_test = None
+        # Resets the ships and tries again until a valid configuration is generated.
+        # Prevents an infinite loop from happening when the ships only fit on the
+        # board in too few configurations to ever be found at random
+        max_attempts = 10 ** 3
 
-        for ship_length, number_of_ships in self.ships_per_length.items():
+        for attempt in range(max_attempts):
+            ships = self._try_placing_ships()
+            if ships is not None:
+                return ships
 
-            for ship_nb in range(number_of_ships):
+        raise ValueError(f"Could not place the ships {self.ships_per_length} on a "
+                         f"{self._W}x{self._H} board in {max_attempts} attempts.")
 
-                # Prevents an infinite loop from happening when an impossible configuration of
-                # ships is generated which would not give a single valid space for the last
-                # ship to be generated
-                number_of_iterations = 0
-                max_iterations = 10 ** 3
+    def _try_placing_ships(self):
+        """ Try to place all the ships of self.ships_per_length on the board.
 
-                # Generate a new ship with length ship_length and valid coordinates
-                while not(self.check_coordinates(ships, ship_to_test)):
+        Returns:
+            list[Ships] : A list of Ship instances, or None if the ships placed
+                first left no valid space for one of the next ones
 
-                    start, end = self.generate_random_coordinates(ship_length)
-                    ship_to_test = Ship(start, end, board_width=self.board_size[0], board_height=self.board_size[1])
-                    number_of_iterations += 1
+        Raises:
+            ValueError: if one of the ships does not fit on the empty board
+        """
 
-                    # Function is stuck in infinite loop, resets the ships by calling
-                    # the generate_ships() method again
-                    if number_of_iterations > max_iterations:
-                        ships = self.generate_ships()
-                        return ships
+        width, height = self._W, self._H
+        board_mask = _box_mask(1, 1, width, height)
 
-                ships.append(ship_to_test)
+        ships = []
+
+        # Bitmask of the cells that are taken by, or too close to, the ships
+        # placed so far
+        forbidden_mask = 0
+
+        for ship_length, number_of_ships in self.ships_per_length.items():
+
+            for ship_nb in range(number_of_ships):
+
+                free_mask = board_mask & ~forbidden_mask
+
+                # A bit is set in these bitmasks for each start cell from which
+                # the next ship_length cells (to the right, or below) are all free.
+                # Rows and columns of the board do not wrap around since the bits
+                # outside of the board are never free
+                horizontal_starts = _run_starts(free_mask, ship_length, 1)
+
+                # A ship of length 1 has the same placements both ways
+                if ship_length == 1:
+                    vertical_starts = 0
+                else:
+                    vertical_starts = _run_starts(free_mask, ship_length, MASK_ROW_BITS)
+
+                horizontal_count = horizontal_starts.bit_count()
+                placement_count = horizontal_count + vertical_starts.bit_count()
+
+                if placement_count == 0:
+                    # The ship does not even fit on the empty board, so no retry
+                    # can ever place it
+                    if forbidden_mask == 0:
+                        raise ValueError(f"A ship of length {ship_length} does not fit "
+                                         f"on a {width}x{height} board.")
+
+                    # An impossible configuration of ships was generated, which does not
+                    # leave a single valid space for this ship
+                    return None
+
+                # Choose one of the valid placements uniformly
+                placement = self._rng.randrange(placement_count)
+                if placement < horizontal_count:
+                    position = _nth_set_bit(horizontal_starts, placement)
+                    x_start, y_start = position % MASK_ROW_BITS, position // MASK_ROW_BITS
+                    x_end, y_end = x_start + ship_length - 1, y_start
+                else:
+                    position = _nth_set_bit(vertical_starts, placement - horizontal_count)
+                    x_start, y_start = position % MASK_ROW_BITS, position // MASK_ROW_BITS
+                    x_end, y_end = x_start, y_start + ship_length - 1
+
+                ship = Ship((x_start, y_start), (x_end, y_end),
+                            board_width=width, board_height=height)
+                forbidden_mask |= ship.halo_mask
+
+                ships.append(ship)
 
         return ships
 
@@ -370,21 +494,18 @@ class ShipFactory:
         if not self.is_ship_in_bound(ship_to_test):
             return False
 
-        # Check that the ship is not overlapping with any other ship
-        # Check that the ship is not near any other ship
-        if len(ships) > 0:
-
-            for ship in ships:
-
-                if self.are_overlapping(ship, ship_to_test):
-                    return False
-
+        # Bitmask of the cells that are taken by, or too close to, the ships.
+        # ship_to_test is in bound so it has a mask, but the other ships may not
+        forbidden_mask = 0
+        for ship in ships:
+            if ship.halo_mask is None:
                 if ship.is_near_ship(ship_to_test):
                     return False
-        else:
-            pass
+            else:
+                forbidden_mask |= ship.halo_mask
 
-        return True
+        # Check that the ship is not overlapping with, nor near, any other ship
+        return (ship_to_test.mask & forbidden_mask) == 0
 
     def is_ship_in_bound(self, ship):
         """ Checks that the ship is in bound
@@ -396,15 +517,9 @@ class ShipFactory:
             bool: True if the coordinates of ship_to_test are within the board, False otherwise
         """
 
-        condition = True
-
-        if not (1 <= ship.x_start <= self.board_size[0] and
-                1 <= ship.x_end <= self.board_size[0] and
-                1 <= ship.y_start <= self.board_size[1] and
-                1 <= ship.y_end <= self.board_size[1]):
-            condition = False
-
-        return condition
+        # x_start <= x_end and y_start <= y_end always hold (see Ship.__init__)
+        return (1 <= ship.x_start and ship.x_end <= self._W and
+                1 <= ship.y_start and ship.y_end <= self._H)
 
     def are_overlapping(self, ship, other_ship):
         """ Checks if two ships are overlapping
@@ -417,11 +532,10 @@ class ShipFactory:
             bool: True if the two ships occupy the same cell(s), False otherwise
         """
 
-        for cell_of_ship in ship.cells:
-            if cell_of_ship in other_ship.cells:
-                return True
+        if ship.mask is None or other_ship.mask is None:
+            return not ship.cells.isdisjoint(other_ship.cells)
 
-        return False
+        return (ship.mask & other_ship.mask) != 0
 
     def generate_random_coordinates(self, dimension):
         """ Generates random coordinates
@@ -437,14 +551,14 @@ class ShipFactory:
         """
 
         # Choose between vertical (1) and horizontal (0)
-        condition_vertical = random.randint(0, 1)
+        condition_vertical = self._rng.randint(0, 1)
 
         if condition_vertical:  # X is fixed, Y is changing
 
-            x_start = random.randint(1, self.board_size[0])
+            x_start = self._rng.randint(1, self._W)
             x_end = x_start
 
-            y_start = random.randint(1, self.board_size[1] - dimension + 1)
+            y_start = self._rng.randint(1, self._H - dimension + 1)
             y_end = y_start + dimension - 1
 
             start = (x_start, y_start)
@@ -452,10 +566,10 @@ class ShipFactory:
 
         else:  # Y is fixed, X is changing
 
-            x_start = random.randint(1, self.board_size[0] - dimension + 1)
+            x_start = self._rng.randint(1, self._W - dimension + 1)
             x_end = x_start + dimension - 1
 
-            y_start = random.randint(1, self.board_size[1])
+            y_start = self._rng.randint(1, self._H)
             y_end = y_start
 
             start = (x_start, y_start)
@@ -1,3 +1,8 @@
+import contextlib
+import multiprocessing as mp
+import os
+import random
+
 from battleship.board import Board
 from battleship.game import Game
 from battleship.player import AutomaticPlayer, ManualPlayer, RandomPlayer
@@ -110,3 +115,54 @@ class AutomaticVsAutomaticSimulation:
         # Creating and launching the game
         game = Game(player1=alice, player2=bob)
         game.play()
+
+
+def _run_one(args):
+    """ Play one game without printing anything.
+
+    Args:
+        args (tuple): (seed, player_ctor_a, player_ctor_b) where seed seeds the
+            random module, and the constructors create the two players without
+            any argument
+
+    Returns:
+        int : 1 if the second player won the game, 0 otherwise
+    """
+    seed, player_ctor_a, player_ctor_b = args
+    random.seed(seed)
+
+    alice = player_ctor_a()
+    bob = player_ctor_b()
+
+    # Who wins is read from the players, not from their names, since
+    # Player.count (and thus the default names) is specific to each process
+    game = Game(player1=alice, player2=bob)
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        game.play()
+
+    return int(alice.has_lost())
+
+
+def simulate_games(n, player_ctor_a=RandomPlayer, player_ctor_b=AutomaticPlayer):
+    """ Play many games in parallel to assess the performance of a player.
+
+    Games are spread across all the CPU cores with a process pool, as Python
+    threads cannot run these CPU-bound games in parallel. Each game is seeded
+    with its index, so a batch of games is reproducible.
+
+    Args:
+        n (int): number of games to play
+        player_ctor_a (callable): creates the first player of each game.
+            Defaults to RandomPlayer
+        player_ctor_b (callable): creates the second player of each game.
+            Defaults to AutomaticPlayer
+
+    Returns:
+        list[int] : for each game (in the order of their seeds), 1 if the
+            second player won and 0 otherwise
+    """
+    chunksize = max(1, n // ((os.cpu_count() or 1) * 4))
+    tasks = ((seed, player_ctor_a, player_ctor_b) for seed in range(n))
+
+    with mp.Pool() as pool:
+        return list(pool.imap(_run_one, tasks, chunksize=chunksize))
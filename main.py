@@ -2,6 +2,33 @@ import sys
 
 import battleship.simulation as sim
 
+
+def _run(simulation, total_plays, collect_results):
+    """ Runs a simulation several times.
+
+    Args:
+        simulation: the simulation to run
+        total_plays (int): number of times to run the simulation
+        collect_results (bool): should the results of the games be added up?
+            Only simulations whose run() returns the result of the game can
+            be collected
+
+    Returns:
+        int : the sum of the results of the games (0 when not collected)
+    """
+    run = simulation.run
+    results = 0
+
+    if collect_results:
+        for _ in range(total_plays):
+            results += run()
+    else:
+        for _ in range(total_plays):
+            run()
+
+    return results
+
+
 if __name__ == '__main__':
     simulations = [
         sim.ManualVsManualSimulation(),
@@ -22,15 +49,8 @@ if __name__ == '__main__':
             index = 0
 
     # Run multiple games at once to better assess the AI's performance
-    results = 0
     total_plays = 10 ** 4
-
-    for play in range(total_plays):
-        simulation = simulations[index]
-        if index == 4:
-            results += simulation.run()
-        else:
-            simulation.run()
+    results = _run(simulations[index], total_plays, index == 4)
 
     print(f"BOB WON {results * 100 / total_plays}% OF THE TIME")
 
@@ -1,10 +1,129 @@
-from battleship.player import RandomPlayer
+import builtins
+
+from battleship.board import Board
+from battleship.player import AutomaticPlayer, ManualPlayer, RandomPlayer
+from battleship.ship import Ship
 
 def test_player():
     player = RandomPlayer("Alice")
     print(player.select_target())
     print(player.select_target())
     print(player.select_target())
+
+def test_get_neighbours_bottom_left():
+    player = AutomaticPlayer("Bob", seed=0)
+
+    # The bottom-left diagonal of the top-right corner is on the board
+    output = player.get_neighbours((10, 1))
+    print(output)
+    assert set(output) == {(9, 1), (9, 2), (10, 2)}
+
+    # The bottom-left diagonal of the top-left corner is not
+    output = player.get_neighbours((1, 1))
+    print(output)
+    assert set(output) == {(1, 2), (2, 1), (2, 2)}
+
+def test_manual_player_lower_case():
+    player = ManualPlayer(Board(), "Alice")
+
+    original_input = builtins.input
+    builtins.input = lambda prompt="": "b3"
+    try:
+        output = player.select_target()
+    finally:
+        builtins.input = original_input
+    print(output)
+    assert output == (2, 3)
+
+def test_receive_result_sink():
+    player = AutomaticPlayer("Bob", seed=0)
+
+    # Hit a ship from (4, 5) to (6, 5), then sink it
+    for cell, has_ship_sunk in [((4, 5), False), ((5, 5), False), ((6, 5), True)]:
+        player.last_target = cell
+        player._candidates.discard(cell)
+        player.receive_result(True, has_ship_sunk)
+        if not has_ship_sunk:
+            print(player._open_hits)
+            assert cell in player._open_hits
+
+    print(player.sunken_ships)
+    assert player.sunken_ships == [((4, 5), (6, 5))]
+    assert player.successful_hits == {(4, 5), (5, 5), (6, 5)}
+    assert len(player._open_hits) == 0
+
+    # No cell of the ship, nor next to it, can be attacked anymore
+    surroundings = {(x, y) for x in range(3, 8) for y in range(4, 7)}
+    assert player.get_ship_surroundings((4, 5), (6, 5)) == surroundings
+    assert player._candidates.isdisjoint(surroundings)
+    assert len(player._candidates) == 100 - len(surroundings)
+
+def test_pick_hunt():
+    player = AutomaticPlayer("Bob", seed=0)
+
+    # A single hit: only its orthogonal neighbours that are still candidates
+    player.last_target = (5, 5)
+    player._candidates.discard((5, 5))
+    player.receive_result(True, False)
+    player._candidates.discard((6, 5))
+    targets = {player._pick_hunt(player._open_hits) for _ in range(100)}
+    print(targets)
+    assert targets == {(4, 5), (5, 4), (5, 6)}
+
+    # Two aligned hits: only the two ends of the line
+    player.last_target = (6, 5)
+    player.receive_result(True, False)
+    targets = {player._pick_hunt(player._open_hits) for _ in range(100)}
+    print(targets)
+    assert targets == {(4, 5), (7, 5)}
+
+    # No candidate left at either end
+    player._candidates.discard((4, 5))
+    player._candidates.discard((7, 5))
+    output = player._pick_hunt(player._open_hits)
+    print(output)
+    assert output is None
+
+    # A hit in a corner of the board
+    player = AutomaticPlayer("Bob", seed=0)
+    player.last_target = (1, 1)
+    player._candidates.discard((1, 1))
+    player.receive_result(True, False)
+    targets = {player._pick_hunt(player._open_hits) for _ in range(100)}
+    print(targets)
+    assert targets == {(2, 1), (1, 2)}
+
+def test_automatic_player_game():
+    for seed in range(10):
+        ships = [
+            Ship(start=(3, 1), end=(3, 5)),
+            Ship(start=(9, 7), end=(9, 10)),
+            Ship(start=(1, 9), end=(3, 9)),
+            Ship(start=(5, 2), end=(6, 2)),
+            Ship(start=(8, 3), end=(8, 3)),
+        ]
+        board = Board(ships)
+        player = AutomaticPlayer("Bob", seed=seed)
+
+        targets = set()
+        while not board.have_all_ships_sunk():
+            target = player.select_target()
+
+            # Never attack the same cell twice, nor next to a sunken ship
+            assert target not in targets
+            assert not any(ship.has_sunk() and ship.is_near_cell(target) for ship in ships)
+            targets.add(target)
+
+            is_ship_hit, has_ship_sunk = board.is_attacked_at(target)
+            player.receive_result(is_ship_hit, has_ship_sunk)
+
+        print(len(targets))
+        assert len(player.sunken_ships) == len(ships)
     
 if __name__ == "__main__":
-    test_player()
\ No newline at end of file
+    test_player()
+    test_get_neighbours_bottom_left()
+    test_manual_player_lower_case()
+    test_receive_result_sink()
+    test_pick_hunt()
+    test_automatic_player_game()
\ No newline at end of file
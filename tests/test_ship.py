@@ -193,6 +193,54 @@ def test_is_near_ship():
     print(output)
     assert output == False
 
+def test_get_neighbours():
+    start = (9, 10)
+    end = (10, 10)
+    ship = Ship(start=start, end=end, board_width=10, board_height=10)
+
+    # Corner cell: no neighbour one past the edge of the board
+    output = ship.get_neighbours((10, 10))
+    print(output)
+    assert output == {(9, 9), (9, 10), (10, 9)}
+
+    # Cell on the first row and column
+    output = ship.get_neighbours((1, 1))
+    print(output)
+    assert output == {(1, 2), (2, 1), (2, 2)}
+
+    # Cell in the middle of the board
+    output = ship.get_neighbours((5, 5))
+    print(output)
+    assert len(output) == 8
+
+def test_off_board_ship():
+    # Ships outside the bitmask range still use their cells
+    ship = Ship(start=(-2, 3), end=(-1, 3))
+    output = ship.has_sunk()
+    print(output)
+    assert output == False
+
+    ship = Ship(start=(-1, 5), end=(1, 5))
+    for cell in [(-1, 5), (0, 5), (1, 5)]:
+        assert ship.receive_damage(cell) == True
+    output = ship.has_sunk()
+    print(output)
+    assert output == True
+
+    ship = Ship(start=(1, -1), end=(1, -1))
+    output = ship.receive_damage((1, -1))
+    print(output)
+    assert output == True
+    assert ship.has_sunk() == True
+
+    ship = Ship(start=(70, 1), end=(71, 1))
+    output = ship.is_near_ship(Ship(start=(7, 2), end=(8, 2)))
+    print(output)
+    assert output == False
+    output = ship.is_near_ship(Ship(start=(72, 2), end=(72, 4)))
+    print(output)
+    assert output == True
+
 
 if __name__ == "__main__":
     test_horizontal()
@@ -203,4 +251,6 @@ if __name__ == "__main__":
     test_receive_damage()
     test_count_damaged_cells()
     test_has_sunk()
-    test_is_near_ship()
\ No newline at end of file
+    test_is_near_ship()
+    test_get_neighbours()
+    test_off_board_ship()
\ No newline at end of file
@@ -1,4 +1,6 @@
-from battleship.ship import ShipFactory
+import random
+
+from battleship.ship import MASK_ROW_BITS, ShipFactory, _nth_set_bit, _run_starts
 from battleship.board import Board
 
 def test_generate_ships():
@@ -9,5 +11,86 @@ def test_generate_ships():
     board = Board(ships=ships)
     board.validate_ships() # No ValueError is good news!
 
+def test_generate_ships_configurations():
+    configurations = [
+        ((10, 10), {1:1, 2:1, 3:1, 4:1, 5:1}),
+        ((10, 10), {1:4, 2:3, 3:2, 4:1}),
+        ((7, 12), {1:2, 2:2, 3:1, 4:1}),
+        ((12, 7), {2:2, 3:2, 5:1}),
+        ((5, 5), {1:2, 3:1}),
+    ]
+    for board_size, ships_per_length in configurations:
+        for seed in range(20):
+            ship_factory = ShipFactory(board_size=board_size,
+                                       ships_per_length=ships_per_length,
+                                       seed=seed)
+            ships = ship_factory.generate_ships()
+            board = Board(ships=ships, size=board_size,
+                          ships_per_length=ships_per_length)
+            board.validate_ships() # No ValueError is good news!
+
+def test_run_starts():
+    rng = random.Random(0)
+    for _ in range(50):
+        free_cells = {(x, y) for x in range(1, 11) for y in range(1, 11)
+                      if rng.random() < 0.7}
+        free_mask = 0
+        for x, y in free_cells:
+            free_mask |= 1 << (y * MASK_ROW_BITS + x)
+
+        for length in range(1, 6):
+            # Brute force: check every cell of the run one by one
+            horizontal = {(x, y) for x, y in free_cells
+                          if all((x + i, y) in free_cells for i in range(length))}
+            vertical = {(x, y) for x, y in free_cells
+                        if all((x, y + i) in free_cells for i in range(length))}
+
+            starts = _run_starts(free_mask, length, 1)
+            assert starts.bit_count() == len(horizontal)
+            assert all(starts >> (y * MASK_ROW_BITS + x) & 1 for x, y in horizontal)
+
+            starts = _run_starts(free_mask, length, MASK_ROW_BITS)
+            assert starts.bit_count() == len(vertical)
+            assert all(starts >> (y * MASK_ROW_BITS + x) & 1 for x, y in vertical)
+
+def test_nth_set_bit():
+    rng = random.Random(0)
+    for _ in range(50):
+        mask = rng.getrandbits(rng.randint(1, 1000))
+        positions = [i for i in range(mask.bit_length()) if mask >> i & 1]
+        for n, position in enumerate(positions):
+            assert _nth_set_bit(mask, n) == position
+
+def test_generate_ships_impossible():
+    # The ship does not fit on the board at all
+    ship_factory = ShipFactory(board_size=(3, 3), ships_per_length={5:1})
+    try:
+        ship_factory.generate_ships()
+    except ValueError as error:
+        print(error)
+    else:
+        assert False, "ValueError not raised"
+
+    # The ships fit one by one, but not all together
+    ship_factory = ShipFactory(board_size=(3, 3), ships_per_length={1:5})
+    try:
+        ship_factory.generate_ships()
+    except ValueError as error:
+        print(error)
+    else:
+        assert False, "ValueError not raised"
+
+def test_create_ship_from_str():
+    # The board size can also be given as a list
+    for board_size in [(10, 10), [10, 10]]:
+        ship = ShipFactory.create_ship_from_str("A3", "C3", board_size=board_size)
+        print(ship)
+        assert ship.cells == {(1, 3), (2, 3), (3, 3)}
+
 if __name__ == "__main__":
-    test_generate_ships()
\ No newline at end of file
+    test_generate_ships()
+    test_generate_ships_configurations()
+    test_run_starts()
+    test_nth_set_bit()
+    test_generate_ships_impossible()
+    test_create_ship_from_str()
@@ -0,0 +1,21 @@
+from battleship.player import RandomPlayer
+from battleship.simulation import simulate_games
+
+def test_simulate_games():
+    n = 20
+    results = simulate_games(n)
+    print(results)
+    assert len(results) == n
+    assert all(result in (0, 1) for result in results)
+
+    # Game i is always seeded with i
+    assert simulate_games(n) == results
+
+    # Two RandomPlayers instead of the default players
+    results = simulate_games(n, RandomPlayer, RandomPlayer)
+    print(results)
+    assert len(results) == n
+    assert all(result in (0, 1) for result in results)
+
+if __name__ == "__main__":
+    test_simulate_games()